@@ -2,9 +2,15 @@
 Todoリストアプリケーションのメインファイル
 Flaskを使用してWebアプリケーションを構築
 """
-from flask import Flask, render_template, request, redirect, url_for, flash
-from sheets_helper import get_all_todos_filtered, add_todo, update_todo, delete_todo, complete_todo
+from flask import Flask, render_template, request, redirect, url_for, flash, session, g, make_response
+from flask_caching import Cache
+from flask_compress import Compress
+from sheets_helper import get_all_todos_filtered, get_todo_columns, materialize_todos, get_todo_by_row, add_todo, update_todo, delete_todo, complete_todo, warm_up, get_cache_generation
 import os
+import functools
+import threading
+import numpy as np
+from datetime import date, timedelta
 from dotenv import load_dotenv
 from pathlib import Path
 
@@ -18,68 +24,237 @@ load_dotenv(dotenv_path=ENV_FILE)
 app = Flask(__name__)
 app.secret_key = os.getenv("SECRET_KEY", "your-secret-key-here")  # セッション管理用の秘密鍵
 
+# レスポンスのgzip圧縮（HTMLは圧縮が効きやすく、転送量を大きく減らせる）
+app.config["COMPRESS_MIMETYPES"] = ["text/html", "application/json"]
+Compress(app)
+
+# 一覧ページの1ページあたりの表示件数（デフォルト・上限）
+DEFAULT_PER_PAGE = 25
+MAX_PER_PAGE = 100
+
+# 一覧ページのレスポンスキャッシュ（クエリ文字列ごとに保持し、データ更新時にクリアする）
+cache = Cache(app, config={"CACHE_TYPE": "SimpleCache", "CACHE_DEFAULT_TIMEOUT": 10})
+
+# 絞り込み・並び替え結果のキャッシュ（条件 -> (列形式のTodo, インデックス配列)）
+_filter_cache = {}
+FILTER_CACHE_SIZE = 128  # 条件の組み合わせの上限（超えたらまとめて破棄する）
+
+def _has_pending_flash():
+    """
+    表示待ちのフラッシュメッセージがあるか（ある場合はキャッシュを使わない）
+    """
+    return "_flashes" in session
+
+@functools.lru_cache(maxsize=4)
+def _date_bounds(ordinal):
+    """
+    期日フィルタに使う日付文字列を求める（日付ごとにキャッシュ）
+    
+    Args:
+        ordinal (int): 今日の日付（date.toordinal()の値）
+    
+    Returns:
+        tuple: (今日, 7日後, 30日後) の "YYYY-MM-DD" 形式の文字列
+    """
+    today = date.fromordinal(ordinal)
+    return (
+        today.strftime("%Y-%m-%d"),
+        (today + timedelta(days=7)).strftime("%Y-%m-%d"),
+        (today + timedelta(days=30)).strftime("%Y-%m-%d")
+    )
+
+def _make_conditional_response(html):
+    """
+    内容から求めたETagを付けてレスポンスを作成する
+    ブラウザが同じ内容を持っている場合（If-None-Matchが一致する場合）は本文なしの304を返す
+    
+    Args:
+        html (str): レンダリング済みのHTML
+    
+    Returns:
+        flask.Response: レスポンス
+    """
+    response = make_response(html)
+    response.add_etag()
+    etag, _ = response.get_etag()
+    
+    # Flask-Compressは圧縮時にETagへ「:gzip」などを付けるため、付く前の値で比較する
+    client_etags = {tag.split(":", 1)[0] for tag in request.if_none_match.as_set()}
+    if etag in client_etags:
+        response = make_response("", 304)
+        response.set_etag(etag)
+    
+    return response
+
+@functools.lru_cache(maxsize=16)
+def _make_due_date_mask(due_date_filter, today_str, week_later, month_later):
+    """
+    期日フィルタの条件を、期日の配列からマスクを求める関数にまとめる（条件・日付ごとにキャッシュ）
+    
+    Args:
+        due_date_filter (str): 期日フィルタ（今日/今週/今月/期限切れ/期日未設定/すべて）
+        today_str (str): 今日の日付
+        week_later (str): 7日後の日付
+        month_later (str): 30日後の日付
+    
+    Returns:
+        callable: 期日のNumPy配列を受け取りブール配列を返す関数（絞り込まない場合はNone）
+    """
+    if due_date_filter == "今日":
+        return lambda due: due == today_str
+    if due_date_filter == "今週":
+        # 期日未設定（空文字）は today_str <= due の比較で除外される
+        return lambda due: (today_str <= due) & (due <= week_later)
+    if due_date_filter == "今月":
+        return lambda due: (today_str <= due) & (due <= month_later)
+    if due_date_filter == "期限切れ":
+        return lambda due: (due != "") & (due < today_str)
+    if due_date_filter == "期日未設定":
+        return lambda due: due == ""
+    return None
+
+def _select_todos(status_filter, columns, priority_filter, due_date_filter, sort_by):
+    """
+    重要度・期日で絞り込み、並び替えたTodoのインデックス配列を求める（結果はキャッシュする）
+    同じデータ（列形式のTodo）・同じ条件の場合は絞り込みをやり直さずに前回の結果を返す
+    
+    Args:
+        status_filter (str): 状態フィルタ（キャッシュのキーに使用）
+        columns (dict): 列形式のTodo
+        priority_filter (str): 重要度フィルタ
+        due_date_filter (str): 期日フィルタ
+        sort_by (str): 並び順（priority/due_date）
+    
+    Returns:
+        numpy.ndarray: 表示順に並んだTodoのインデックス（変更しないこと）
+    """
+    ordinal = date.today().toordinal()
+    key = (status_filter, priority_filter, due_date_filter, sort_by, ordinal)
+    cached = _filter_cache.get(key)
+    # キャッシュ作成時と同じデータの場合のみ使用（データが再取得されると列形式のTodoも作り直される）
+    if cached is not None and cached[0] is columns:
+        return cached[1]
+    
+    priority_arr = columns["priority_arr"]
+    due_arr = columns["due_date_arr"]
+    
+    # 絞り込み条件はNumPyのブール配列（マスク）にまとめて計算する
+    mask = np.ones(len(due_arr), dtype=bool)
+    
+    # 重要度でフィルタリング
+    if priority_filter != "すべて":
+        mask &= priority_arr == priority_filter
+    
+    # 期日でフィルタリング（"すべて"の場合はフィルタリングしない）
+    due_date_mask = _make_due_date_mask(due_date_filter, *_date_bounds(ordinal))
+    if due_date_mask is not None:
+        mask &= due_date_mask(due_arr)
+    
+    selected = np.flatnonzero(mask)
+    
+    # ソート処理（重要度はキャッシュ作成時に数値化済み: 高=3, 中=2, 低=1）
+    rank_sel = columns["priority_rank_arr"][selected]
+    due_sel = due_arr[selected]
+    
+    if sort_by == "priority":
+        # 重要度順: 高 > 中 > 低（同じ場合は期日の遅い順、それも同じ場合は元の順序）
+        order = np.lexsort((-np.arange(len(selected)), due_sel, rank_sel))[::-1]
+        selected = selected[order]
+    elif sort_by == "due_date":
+        # 期日順: 早い順（期日未設定は最後、同じ期日は重要度の低い順）
+        order = np.lexsort((rank_sel, np.where(due_sel == "", "9999-12-31", due_sel)))
+        selected = selected[order]
+    
+    selected.flags.writeable = False
+    if len(_filter_cache) >= FILTER_CACHE_SIZE:
+        _filter_cache.clear()
+    _filter_cache[key] = (columns, selected)
+    return selected
+
+def _is_cacheable_index():
+    """
+    作成した一覧ページをキャッシュしてよいか
+    エラー画面や、作成中にデータが更新された（更新前のデータで作成した可能性がある）ページはキャッシュしない
+    """
+    if g.get("index_error", False):
+        return False
+    return g.get("index_generation") == get_cache_generation()
+
+def _clear_page_caches():
+    """
+    一覧ページのキャッシュ（レスポンス・絞り込み結果）をクリアする（データ更新時に呼び出す）
+    """
+    cache.clear()
+    _filter_cache.clear()
+
 @app.route("/")
 def index():
     """
     トップページ：Todo一覧を表示（フィルタリング・ソート機能付き）
     """
+    return _make_conditional_response(_render_index())
+
+@cache.cached(
+    timeout=10,
+    query_string=True,
+    unless=_has_pending_flash,
+    response_filter=lambda response: _is_cacheable_index()
+)
+def _render_index():
+    """
+    Todo一覧のHTMLを作成する（クエリ文字列ごとにキャッシュ）
+    """
+    # データを読む前の世代を記録しておく（作成中に更新された場合はキャッシュしない）
+    g.index_generation = get_cache_generation()
     try:
-        from datetime import datetime, timedelta
-        
         # フィルタリングパラメータを取得
         status_filter = request.args.get("status", "未完了")  # デフォルト: 未完了
         priority_filter = request.args.get("priority", "すべて")  # デフォルト: すべて
         due_date_filter = request.args.get("due_date", "すべて")  # デフォルト: すべて
         sort_by = request.args.get("sort", "priority")  # デフォルト: 重要度順
+        page = request.args.get("page", 1, type=int)  # デフォルト: 1ページ目
+        per_page = request.args.get("per_page", DEFAULT_PER_PAGE, type=int)
+        per_page = min(max(per_page, 1), MAX_PER_PAGE)
         
-        # ステータスでフィルタリング
+        # ステータスでフィルタリング（列形式のTodoを取得し、以降は列ごとに絞り込む）
         if status_filter == "完了":
-            todos = get_all_todos_filtered(status_filter="完了")
+            columns = get_todo_columns(status_filter="完了")
         elif status_filter == "すべて":
-            todos = get_all_todos_filtered(status_filter="all")
+            columns = get_todo_columns(status_filter="all")
         else:  # 未完了
-            todos = get_all_todos_filtered(status_filter=None)
-        
-        # 重要度でフィルタリング
-        if priority_filter != "すべて":
-            todos = [todo for todo in todos if todo.get("priority") == priority_filter]
+            columns = get_todo_columns(status_filter=None)
         
-        # 期日でフィルタリング
-        today = datetime.now().date()
-        today_str = today.strftime("%Y-%m-%d")
-        week_later = (today + timedelta(days=7)).strftime("%Y-%m-%d")
-        month_later = (today + timedelta(days=30)).strftime("%Y-%m-%d")
+        # 取得に失敗した場合は空の一覧をキャッシュしない（0件のページが残らないようにする）
+        if columns.get("fetch_failed"):
+            g.index_error = True
+            flash("Todoの取得に失敗しました。しばらくしてから再読み込みしてください。", "error")
         
-        if due_date_filter == "今日":
-            todos = [todo for todo in todos if todo.get("due_date") == today_str]
-        elif due_date_filter == "今週":
-            todos = [todo for todo in todos if todo.get("due_date") and today_str <= todo.get("due_date") <= week_later]
-        elif due_date_filter == "今月":
-            todos = [todo for todo in todos if todo.get("due_date") and today_str <= todo.get("due_date") <= month_later]
-        elif due_date_filter == "期限切れ":
-            todos = [todo for todo in todos if todo.get("due_date") and todo.get("due_date") < today_str]
-        elif due_date_filter == "期日未設定":
-            todos = [todo for todo in todos if not todo.get("due_date")]
-        # "すべて"の場合はフィルタリングしない
+        # 重要度・期日で絞り込み、並び替える（結果はインデックスの配列）
+        selected = _select_todos(status_filter, columns, priority_filter, due_date_filter, sort_by)
         
-        # ソート処理
-        priority_order = {"高": 3, "中": 2, "低": 1}
+        # ページ分割（絞り込み・並び替え後の結果に対して行う）
+        total = len(selected)
+        total_pages = max((total + per_page - 1) // per_page, 1)
+        page = min(max(page, 1), total_pages)
+        start = (page - 1) * per_page
         
-        if sort_by == "priority":
-            # 重要度順: 高 > 中 > 低
-            todos.sort(key=lambda x: (priority_order.get(x.get("priority", "中"), 2), x.get("due_date", "")), reverse=True)
-        elif sort_by == "due_date":
-            # 期日順: 早い順
-            todos.sort(key=lambda x: (x.get("due_date") or "9999-12-31", priority_order.get(x.get("priority", "中"), 2)), reverse=False)
+        # 表示するページのTodoだけを辞書に変換
+        todos = materialize_todos(columns, selected[start:start + per_page].tolist())
         
         # 完了したTodoは取り消し線のスタイルを適用するため、完了状態をテンプレートに渡す
         return render_template("index.html", 
                              todos=todos, 
+                             total=total,
+                             page=page,
+                             per_page=per_page,
+                             total_pages=total_pages,
+                             start=start,
                              sort_by=sort_by,
                              status_filter=status_filter,
                              priority_filter=priority_filter,
                              due_date_filter=due_date_filter)
     except Exception as e:
+        g.index_error = True
         error_message = str(e)
         # エラーメッセージをより読みやすくする
         if "storageQuotaExceeded" in error_message or "storage quota" in error_message.lower():
@@ -113,6 +288,7 @@ def add():
         
         try:
             add_todo(title, content, due_date, priority)
+            _clear_page_caches()
             flash("Todoを追加しました！", "success")
             return redirect(url_for("index"))
         except Exception as e:
@@ -132,14 +308,7 @@ def edit(row):
     """
     Todoを編集するページ
     """
-    todos = get_all_todos_filtered(status_filter="all")  # すべてのタスクから検索
-    todo = None
-    
-    # 該当するTodoを検索
-    for t in todos:
-        if t["row"] == row:
-            todo = t
-            break
+    todo = get_todo_by_row(row)  # 該当する行だけを取得
     
     if not todo:
         flash("Todoが見つかりませんでした。", "error")
@@ -158,6 +327,7 @@ def edit(row):
         
         try:
             update_todo(row, title, content, due_date, priority)
+            _clear_page_caches()
             flash("Todoを更新しました！", "success")
             return redirect(url_for("index"))
         except Exception as e:
@@ -173,6 +343,7 @@ def delete(row):
     """
     try:
         delete_todo(row)
+        _clear_page_caches()
         flash("Todoを削除しました！", "success")
     except Exception as e:
         flash(f"エラーが発生しました: {str(e)}", "error")
@@ -186,6 +357,7 @@ def complete(row):
     """
     try:
         complete_todo(row)
+        _clear_page_caches()
         flash("Todoを完了にしました！", "success")
         return redirect(url_for("archive"))
     except Exception as e:
@@ -199,7 +371,7 @@ def archive():
     """
     try:
         completed_todos = get_all_todos_filtered(status_filter="完了")  # 完了のみ
-        return render_template("archive.html", todos=completed_todos)
+        return _make_conditional_response(render_template("archive.html", todos=completed_todos))
     except Exception as e:
         flash(f"エラーが発生しました: {str(e)}", "error")
         return render_template("archive.html", todos=[])
@@ -209,6 +381,11 @@ if __name__ == "__main__":
     # ポート5000が使用されている場合は、環境変数PORTで指定するか、デフォルトで5001を使用
     port = int(os.getenv("PORT", 5001))
     print(f"\nサーバーを起動しています...")
-    print(f"ブラウザで http://localhost:{port} にアクセスしてください\n")
+    print(f"ブラウザで http://localhost:{port} にアクセスしてください")
+    print(f"本番環境では gunicorn -k gthread -w 1 --threads 8 -b 0.0.0.0:{port} wsgi:application を使用してください\n")
+    # バックグラウンドでGoogle Sheetsへ接続しておく（最初のアクセスの待ち時間を減らす）
+    # リローダーの監視プロセスでは行わず、実際にリクエストを処理する子プロセスでのみ行う
+    if os.environ.get("WERKZEUG_RUN_MAIN") == "true":
+        threading.Thread(target=warm_up, daemon=True).start()
     app.run(debug=True, host="0.0.0.0", port=port)
 
@@ -0,0 +1,15 @@
+"""
+gunicornの設定ファイル
+起動時のカレントディレクトリにあれば gunicorn が自動で読み込む
+"""
+import threading
+
+
+def post_worker_init(worker):
+    """
+    ワーカーの起動後にバックグラウンドでGoogle Sheetsへ接続しておく（最初のアクセスの待ち時間を減らす）
+    アプリの読み込み時ではなくワーカーごとに行うため、--preload を指定しても各ワーカーで実行される
+    """
+    from sheets_helper import warm_up
+
+    threading.Thread(target=warm_up, daemon=True).start()
@@ -2,8 +2,16 @@
 Google Sheets APIを使用してTodoデータを管理するヘルパー関数
 """
 import gspread
+import numpy as np
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_exponential_jitter
+from gspread.utils import ValueRenderOption
 from google.oauth2.service_account import Credentials
+from google.auth.transport.requests import AuthorizedSession
+from requests.adapters import HTTPAdapter
 import os
+import csv
+import io
+import threading
 from dotenv import load_dotenv
 from pathlib import Path
 from datetime import datetime, timedelta
@@ -15,15 +23,127 @@ ENV_FILE = BASE_DIR / ".env"
 # 環境変数を読み込む（明示的にパスを指定）
 load_dotenv(dotenv_path=ENV_FILE)
 
-# キャッシュ用のグローバル変数
-_todos_cache = None
-_cache_timestamp = None
 CACHE_DURATION = timedelta(seconds=10)  # キャッシュの有効期限（10秒）
 
-# クライアントキャッシュ
+class _TodoCache:
+    """
+    ステータスフィルタごとのTodoキャッシュ（stale-while-revalidate方式）
+    
+    有効期限が切れていてもデータがあればすぐに返し、再取得はバックグラウンドで行う。
+    データがない場合（起動直後・データ更新後）のみ取得が終わるまで待つ。
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}  # status_filter -> (columns, timestamp)
+        self._refreshing = set()  # バックグラウンドで再取得中のstatus_filter
+        self._generation = 0  # clear()のたびに増やし、クリア前に始まった再取得の結果を破棄する
+    
+    def get(self, status_filter, loader):
+        """
+        キャッシュからTodoを取得する
+        
+        Args:
+            status_filter (str, optional): ステータスフィルタ
+            loader (callable): status_filterを受け取り列形式のTodoを返す関数
+        
+        Returns:
+            dict: 列形式のTodo（_to_columnsを参照）
+        """
+        with self._lock:
+            entry = self._entries.get(status_filter)
+            generation = self._generation
+            if entry is not None:
+                columns, timestamp = entry
+                if datetime.now() - timestamp >= CACHE_DURATION and status_filter not in self._refreshing:
+                    # 期限切れ: 古いデータを返しつつバックグラウンドで再取得
+                    self._refreshing.add(status_filter)
+                    threading.Thread(
+                        target=self._refresh,
+                        args=(status_filter, loader, generation),
+                        daemon=True
+                    ).start()
+                return columns
+        
+        # キャッシュがない場合は取得が終わるまで待つ
+        columns = loader(status_filter)
+        self._store(status_filter, columns, generation)
+        return columns
+    
+    def find_row(self, row):
+        """
+        有効期限内のキャッシュから行番号でTodoを探す
+        
+        Args:
+            row (int): 行番号
+        
+        Returns:
+            dict: Todoの情報（キャッシュにない場合はNone）
+        """
+        now = datetime.now()
+        with self._lock:
+            for columns, timestamp in self._entries.values():
+                index = columns["by_row"].get(row)
+                if now - timestamp < CACHE_DURATION and index is not None:
+                    return materialize_todos(columns, [index])[0]
+        return None
+    
+    @property
+    def generation(self):
+        """
+        clear()された回数（取得中にデータが更新されたかの判定に使用）
+        """
+        with self._lock:
+            return self._generation
+    
+    def clear(self):
+        """
+        キャッシュをすべて破棄する
+        """
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+    
+    def _refresh(self, status_filter, loader, generation):
+        try:
+            self._store(status_filter, loader(status_filter), generation)
+        except Exception as e:
+            print(f"警告: Todoの再取得中にエラーが発生しました: {str(e)}")
+        finally:
+            with self._lock:
+                self._refreshing.discard(status_filter)
+    
+    def _store(self, status_filter, columns, generation):
+        with self._lock:
+            # 取得中にclear()された場合は古いデータなので保存しない
+            if generation == self._generation:
+                self._entries[status_filter] = (columns, datetime.now())
+
+# キャッシュ用のグローバル変数
+_todos_cache = _TodoCache()
+
+# Todoの項目（キャッシュではこの項目ごとのリストとして保持する）
+TODO_FIELDS = ("id", "row", "title", "content", "due_date", "priority", "created_at", "status")
+
+# 絞り込みに使う項目（NumPy配列としても保持し、一覧ページでまとめて比較する）
+FILTER_FIELDS = ("due_date", "priority")
+
+# 重要度の並び順（高 > 中 > 低、不明な値は中として扱う）
+PRIORITY_RANK = {"高": 3, "中": 2, "低": 1}
+
+# クライアントキャッシュ（複数スレッドから同時に初期化されないようロックで保護する）
 _sheets_client = None
 _spreadsheet_cache = None
 _worksheet_cache = None
+_client_lock = threading.Lock()
+_spreadsheet_lock = threading.Lock()
+_header_checked = False  # ヘッダー行を確認済みか（プロセスごとに1回だけ確認する）
+# ID採番用セルの読み取りから更新までを直列化するロック
+# （同じプロセス内の同時追加のみ防げる。別プロセスや他のクライアントからの同時追加ではIDが重複しうる）
+_id_lock = threading.Lock()
+
+# HTTP接続プールの最大接続数（gunicornのスレッド数＋バックグラウンド更新分）
+HTTP_POOL_MAXSIZE = 20
 
 # Google Sheets APIのスコープ
 SCOPE = [
@@ -31,6 +151,113 @@ SCOPE = [
     "https://www.googleapis.com/auth/drive"
 ]
 
+# ヘッダー行（A〜G列）
+HEADER_ROW = ["ID", "タイトル", "内容", "期日", "重要度", "作成日時", "ステータス"]
+
+# 行番号列（H列）の見出しと数式
+# サーバー側クエリでは行番号を取得できないため、ARRAYFORMULAで各行に行番号を出力しておく
+ROW_NUMBER_HEADER = "行"
+ROW_NUMBER_FORMULA = '={"行";ARRAYFORMULA(IF(A2:A="",,ROW(A2:A)))}'
+
+# ID採番用のセル（最後に割り当てたIDを保持する）
+ID_COUNTER_CELL = "I1"
+
+# Google Visualization APIのエンドポイント（スプレッドシート側でクエリを実行する）
+GVIZ_URL = "https://docs.google.com/spreadsheets/d/{spreadsheet_id}/gviz/tq"
+
+# ステータスフィルタごとのクエリ（None=未完了のみ, "完了"=完了のみ, "all"=すべて）
+STATUS_QUERIES = {
+    None: "select A, B, C, D, E, F, G, H where A is not null and (G is null or G != '完了')",
+    "完了": "select A, B, C, D, E, F, G, H where A is not null and G = '完了'",
+    "all": "select A, B, C, D, E, F, G, H where A is not null",
+}
+
+# APIの利用制限（429）やサーバーエラー（5xx）時の再試行設定
+RETRY_ATTEMPTS = 5  # 最大試行回数
+RETRY_MAX_WAIT = 8  # 1回あたりの最大待ち時間（秒）
+_retry_backoff = wait_exponential_jitter(initial=0.5, max=RETRY_MAX_WAIT)
+
+def _api_status(exception):
+    """
+    gspreadのAPIErrorからHTTPステータスコードを取得する（APIError以外はNone）
+    """
+    if isinstance(exception, gspread.exceptions.APIError) and exception.response is not None:
+        return exception.response.status_code
+    return None
+
+def _is_rate_limited(exception):
+    """
+    利用制限（429）によるエラーか（リクエストは処理されていないため、どの操作でも再試行できる）
+    """
+    return _api_status(exception) == 429
+
+def _is_transient(exception):
+    """
+    利用制限（429）またはサーバーエラー（5xx）によるエラーか
+    5xxの場合は処理が反映されている可能性があるため、読み込みと同じ内容を書き込む操作だけに使う
+    """
+    status = _api_status(exception)
+    return status is not None and (status == 429 or status >= 500)
+
+def _wait_retry_after(retry_state):
+    """
+    再試行までの待ち時間を決める（Retry-Afterヘッダーがあればそれに従い、なければ指数バックオフ＋ジッター）
+    """
+    exception = retry_state.outcome.exception()
+    retry_after = exception.response.headers.get("Retry-After", "") if _api_status(exception) else ""
+    if retry_after.isdigit():
+        return min(int(retry_after), RETRY_MAX_WAIT)
+    return _retry_backoff(retry_state)
+
+# 読み込み・同じ内容を書き込む操作用（429・5xxで再試行）
+_retry_transient = retry(
+    retry=retry_if_exception(_is_transient),
+    wait=_wait_retry_after,
+    stop=stop_after_attempt(RETRY_ATTEMPTS),
+    reraise=True  # 再試行しても失敗した場合は元のAPIErrorをそのまま送出する
+)
+
+# 行の追加・削除用（二重に反映されないよう429のときだけ再試行）
+_retry_rate_limited = retry(
+    retry=retry_if_exception(_is_rate_limited),
+    wait=_wait_retry_after,
+    stop=stop_after_attempt(RETRY_ATTEMPTS),
+    reraise=True
+)
+
+def _create_sheets_client():
+    """
+    認証情報を読み込んでGoogle Sheets APIクライアントを作成する
+    
+    Returns:
+        gspread.Client: Google Sheetsクライアント
+    """
+    # 環境変数から認証情報を取得（Renderなどのクラウド環境用）
+    credentials_json = os.getenv("GOOGLE_CREDENTIALS_JSON")
+    
+    if credentials_json:
+        # 環境変数からJSON文字列を読み込む
+        import json
+        creds_info = json.loads(credentials_json)
+        creds = Credentials.from_service_account_info(creds_info, scopes=SCOPE)
+    else:
+        # ローカル環境: credentials.jsonファイルから読み込む
+        creds_file = os.getenv("GOOGLE_CREDENTIALS_FILE", "credentials.json")
+        if not os.path.exists(creds_file):
+            raise FileNotFoundError(
+                f"認証情報ファイル '{creds_file}' が見つかりません。\n"
+                "ローカル環境では credentials.json を配置してください。\n"
+                "クラウド環境では GOOGLE_CREDENTIALS_JSON 環境変数を設定してください。"
+            )
+        creds = Credentials.from_service_account_file(creds_file, scopes=SCOPE)
+    
+    # 接続を使い回すセッション（複数スレッドから同時に使っても接続を作り直さないようプールを広げる）
+    session = AuthorizedSession(creds)
+    adapter = HTTPAdapter(pool_maxsize=HTTP_POOL_MAXSIZE)
+    session.mount("https://", adapter)
+    
+    return gspread.Client(auth=creds, session=session)
+
 def get_sheets_client():
     """
     Google Sheets APIクライアントを取得する（キャッシュ機能付き）
@@ -41,26 +268,10 @@ def get_sheets_client():
     global _sheets_client
     
     if _sheets_client is None:
-        # 環境変数から認証情報を取得（Renderなどのクラウド環境用）
-        credentials_json = os.getenv("GOOGLE_CREDENTIALS_JSON")
-        
-        if credentials_json:
-            # 環境変数からJSON文字列を読み込む
-            import json
-            creds_info = json.loads(credentials_json)
-            creds = Credentials.from_service_account_info(creds_info, scopes=SCOPE)
-        else:
-            # ローカル環境: credentials.jsonファイルから読み込む
-            creds_file = os.getenv("GOOGLE_CREDENTIALS_FILE", "credentials.json")
-            if not os.path.exists(creds_file):
-                raise FileNotFoundError(
-                    f"認証情報ファイル '{creds_file}' が見つかりません。\n"
-                    "ローカル環境では credentials.json を配置してください。\n"
-                    "クラウド環境では GOOGLE_CREDENTIALS_JSON 環境変数を設定してください。"
-                )
-            creds = Credentials.from_service_account_file(creds_file, scopes=SCOPE)
-        
-        _sheets_client = gspread.authorize(creds)
+        with _client_lock:
+            # ロック待ちの間に他のスレッドが作成している場合があるため再確認
+            if _sheets_client is None:
+                _sheets_client = _create_sheets_client()
     
     return _sheets_client
 
@@ -77,9 +288,31 @@ def get_or_create_spreadsheet():
     global _spreadsheet_cache, _worksheet_cache
     
     # キャッシュがあれば使用
-    if _spreadsheet_cache is not None and _worksheet_cache is not None:
-        return _spreadsheet_cache, _worksheet_cache
+    spreadsheet, worksheet = _spreadsheet_cache, _worksheet_cache
+    if spreadsheet is not None and worksheet is not None:
+        return spreadsheet, worksheet
+    
+    with _spreadsheet_lock:
+        # ロック待ちの間に他のスレッドが取得している場合があるため再確認
+        if _spreadsheet_cache is not None and _worksheet_cache is not None:
+            return _spreadsheet_cache, _worksheet_cache
+        
+        spreadsheet, worksheet = _open_spreadsheet()
+        
+        # キャッシュに保存（ヘッダー行の確認に失敗した場合は保存せず、次回の呼び出しで再確認する）
+        if _header_checked:
+            _spreadsheet_cache = spreadsheet
+            _worksheet_cache = worksheet
+        
+        return spreadsheet, worksheet
+
+def _open_spreadsheet():
+    """
+    スプレッドシートを開き、ワークシートとヘッダー行を準備する
     
+    Returns:
+        tuple: (spreadsheet, worksheet) のタプル
+    """
     client = get_sheets_client()
     spreadsheet_id = os.getenv("SPREADSHEET_ID")
     
@@ -136,137 +369,297 @@ def get_or_create_spreadsheet():
     try:
         worksheet = spreadsheet.worksheet("Todos")
     except gspread.exceptions.WorksheetNotFound:
-        # ワークシートが存在しない場合は新規作成
+        # ワークシートが存在しない場合は新規作成（ヘッダー行は下で設定する）
         worksheet = spreadsheet.add_worksheet(title="Todos", rows=1000, cols=10)
-        # ヘッダー行を追加
-        worksheet.append_row(["ID", "タイトル", "内容", "期日", "作成日時"])
     
-    # ヘッダー行が存在するか確認（空のワークシートの場合はエラーを防ぐ）
-    try:
-        header_row = worksheet.row_values(1)
-        if not header_row or len(header_row) == 0:
-            # 完全に空の場合はヘッダーを追加（重要度・ステータス列を含む）
-            worksheet.update("A1:G1", [["ID", "タイトル", "内容", "期日", "重要度", "作成日時", "ステータス"]])
-        elif header_row[0] != "ID" or len(header_row) < 7:
-            # ヘッダーが正しくない場合、または重要度・ステータス列がない場合は修正
-            if len(header_row) < 7:
-                # 重要度・ステータス列を追加
-                if len(header_row) < 5:
-                    # 重要度列もステータス列もない
-                    worksheet.update("A1:G1", [["ID", "タイトル", "内容", "期日", "重要度", "作成日時", "ステータス"]])
-                elif len(header_row) < 6:
-                    # 重要度列がない
-                    worksheet.update("A1:G1", [["ID", "タイトル", "内容", "期日", "重要度", "作成日時", "ステータス"]])
-                else:
-                    # ステータス列だけ追加
-                    worksheet.update("G1", [["ステータス"]])
-                    if len(header_row) < 5 or header_row[4] != "重要度":
-                        worksheet.update("E1", [["重要度"]])
-            else:
-                # 既存のヘッダーを確認
-                if header_row[0] != "ID":
-                    worksheet.update("A1:G1", [["ID", "タイトル", "内容", "期日", "重要度", "作成日時", "ステータス"]])
-                else:
-                    # 重要度列とステータス列を確認
-                    if len(header_row) < 5 or header_row[4] != "重要度":
-                        worksheet.update("E1", [["重要度"]])
-                    if len(header_row) < 7 or header_row[6] != "ステータス":
-                        worksheet.update("G1", [["ステータス"]])
-    except (IndexError, gspread.exceptions.APIError):
-        # エラーが発生した場合はヘッダーを設定（重要度・ステータス列を含む）
-        try:
-            worksheet.update("A1:G1", [["ID", "タイトル", "内容", "期日", "重要度", "作成日時", "ステータス"]])
-        except:
-            # 既にヘッダーがある場合は重要度・ステータス列だけ追加
-            try:
-                worksheet.update("E1", [["重要度"]])
-            except:
-                pass
-            try:
-                worksheet.update("G1", [["ステータス"]])
-            except:
-                pass
-    
-    # キャッシュに保存
-    _spreadsheet_cache = spreadsheet
-    _worksheet_cache = worksheet
+    # ヘッダー行の確認はプロセスごとに1回だけ行う
+    if not _header_checked:
+        _ensure_header(worksheet)
     
     return spreadsheet, worksheet
 
+def _ensure_header(worksheet):
+    """
+    ヘッダー行・行番号列（H列）・ID採番用セル（I1）を確認し、不足があれば1回の書き込みでまとめて設定する
+    読み込みに失敗した場合は何も書き換えない（確認済みにならないため、次回のスプレッドシート取得時に再確認する）
+    
+    Args:
+        worksheet (gspread.Worksheet): Todosワークシート
+    """
+    global _header_checked
+    
+    try:
+        header_row = worksheet.row_values(1, value_render_option=ValueRenderOption.unformatted)
+        
+        setup_updates = []
+        
+        # ヘッダー（A〜G列）が正しくない場合は書き直す
+        if header_row[:7] != HEADER_ROW:
+            setup_updates.append({"range": "A1:G1", "values": [HEADER_ROW]})
+        
+        # 行番号列（H列）がない場合は数式を設定
+        if len(header_row) < 8 or header_row[7] != ROW_NUMBER_HEADER:
+            setup_updates.append({"range": "H1", "values": [[ROW_NUMBER_FORMULA]]})
+        
+        # ID採番用のセル（I1）がない場合は既存の最大IDで初期化
+        if len(header_row) < 9 or not isinstance(header_row[8], int):
+            setup_updates.append({"range": ID_COUNTER_CELL, "values": [[_max_id(worksheet)]]})
+        
+        if setup_updates:
+            worksheet.batch_update(setup_updates, value_input_option="USER_ENTERED")
+    except gspread.exceptions.APIError as e:
+        # 一時的なエラーでヘッダーがないと誤って判断し、正しいID採番用セルを書き換えないようにする
+        print(f"警告: ヘッダー行の確認中にエラーが発生しました: {str(e)}")
+        return
+    
+    _header_checked = True
+
+def warm_up():
+    """
+    起動時にGoogle Sheetsへの接続を確立し、一覧ページ（未完了）のデータを取得しておく
+    認証・TLS接続・スプレッドシートの読み込みを最初のリクエストより前に済ませるために使用する
+    """
+    try:
+        get_or_create_spreadsheet()
+        get_todo_columns(status_filter=None)
+    except Exception as e:
+        # 失敗しても最初のリクエスト時に改めて接続するため、警告だけ表示する
+        print(f"警告: Google Sheetsへの事前接続に失敗しました: {str(e)}")
+
 def clear_cache():
     """
     キャッシュをクリアする（データ更新時に呼び出す）
     """
-    global _todos_cache, _cache_timestamp, _spreadsheet_cache, _worksheet_cache
-    _todos_cache = None
-    _cache_timestamp = None
-    _spreadsheet_cache = None
-    _worksheet_cache = None
+    global _spreadsheet_cache, _worksheet_cache
+    _todos_cache.clear()
+    with _spreadsheet_lock:
+        _spreadsheet_cache = None
+        _worksheet_cache = None
+
+def _reset_header_check():
+    """
+    ヘッダー行を確認し直す（次回のスプレッドシート取得時に_ensure_headerを再実行する）
+    """
+    global _header_checked, _spreadsheet_cache, _worksheet_cache
+    with _spreadsheet_lock:
+        _header_checked = False
+        _spreadsheet_cache = None
+        _worksheet_cache = None
+
+def get_cache_generation():
+    """
+    Todoキャッシュの世代を取得する（clear_cacheのたびに増える）
+    値を読んだ時点から変わっていれば、その間にデータが更新されたことを表す
+    
+    Returns:
+        int: キャッシュの世代
+    """
+    return _todos_cache.generation
+
+def _row_to_todo(row, row_number):
+    """
+    スプレッドシートの1行分の値をTodoの辞書に変換する
+    
+    Args:
+        row (list): 行の値（A〜G列）
+        row_number (int): スプレッドシート上の行番号
+    
+    Returns:
+        dict: Todoの情報
+    """
+    # データが不足している場合はデフォルト値を使用
+    return {
+        "id": str(row[0]) if len(row) > 0 and row[0] != "" else "",
+        "row": row_number,  # 行番号を保存（編集・削除時に使用）
+        "title": row[1] if len(row) > 1 else "",
+        "content": row[2] if len(row) > 2 else "",
+        "due_date": row[3] if len(row) > 3 else "",
+        "priority": row[4] if len(row) > 4 else "中",  # 重要度（デフォルト: 中）
+        "created_at": row[5] if len(row) > 5 else "",
+        "status": row[6] if len(row) > 6 else ""  # ステータス列
+    }
 
-def get_all_todos():
+@_retry_transient
+def _query_todos(status_filter):
     """
-    すべてのTodoを取得する（キャッシュ機能付き）
+    スプレッドシート側でステータスによる絞り込みを行い、該当するTodoだけを取得する
+    
+    Args:
+        status_filter (str, optional): STATUS_QUERIESのキー
+    
+    Returns:
+        dict: 列形式のTodo（_to_columnsを参照）
+    """
+    spreadsheet, _ = get_or_create_spreadsheet()
+    
+    response = spreadsheet.client.request(
+        "get",
+        GVIZ_URL.format(spreadsheet_id=spreadsheet.id),
+        params={
+            "sheet": "Todos",
+            "headers": 1,
+            "tqx": "out:csv",
+            "tq": STATUS_QUERIES[status_filter]
+        }
+    )
+    
+    rows = csv.reader(io.StringIO(response.content.decode("utf-8")))
+    next(rows, None)  # 1行目は見出し
+    
+    todos = []
+    for row in rows:
+        # IDが空の行はスキップ
+        if not row or not row[0]:
+            continue
+        # 行番号（H列）が取得できない場合はH1の数式がない・壊れているため、すべての行で取得できない
+        # 0件として扱わずにエラーにし、次回のスプレッドシート取得時に数式を設定し直す
+        if len(row) < 8 or not row[7].isdigit():
+            _reset_header_check()
+            raise ValueError("行番号列（H列）を取得できませんでした。H1の数式を確認してください。")
+        todos.append(_row_to_todo(row[:7], int(row[7])))
+    
+    return _to_columns(todos)
+
+def _to_columns(todos):
+    """
+    Todoのリストを列形式（Structure of Arrays）に変換する
+    絞り込みは列ごとのリストに対するループで済み、行番号からの検索はby_rowで即座に行える
+    
+    Args:
+        todos (list): Todoのリスト（各Todoは辞書形式）
+    
+    Returns:
+        dict: TODO_FIELDSの各項目をキーとするリスト、FILTER_FIELDSの各項目のNumPy配列（"<項目>_arr"）、
+              重要度の並び順の配列（priority_rank_arr）、行番号→インデックスの辞書（by_row）
+    """
+    columns = {field: [todo[field] for todo in todos] for field in TODO_FIELDS}
+    for field in FILTER_FIELDS:
+        # 空のリストでも文字列型になるようdtypeを指定
+        columns[f"{field}_arr"] = np.array(columns[field], dtype=str)
+    # 並び替え用に重要度を数値にしておく
+    columns["priority_rank_arr"] = np.array(
+        [PRIORITY_RANK.get(priority, 2) for priority in columns["priority"]], dtype=np.int8
+    )
+    columns["by_row"] = {row: i for i, row in enumerate(columns["row"])}
+    
+    # キャッシュはコピーせずにそのまま返すため、配列は書き換えできないようにしておく
+    for field in (*(f"{field}_arr" for field in FILTER_FIELDS), "priority_rank_arr"):
+        columns[field].flags.writeable = False
+    return columns
+
+def materialize_todos(columns, indices):
+    """
+    列形式のTodoから、指定したインデックスのTodoだけを辞書に変換する
+    
+    Args:
+        columns (dict): 列形式のTodo
+        indices (iterable): 変換するTodoのインデックス
     
     Returns:
         list: Todoのリスト（各Todoは辞書形式）
     """
-    global _todos_cache, _cache_timestamp
+    fields = [(field, columns[field]) for field in TODO_FIELDS]
+    return [{field: values[i] for field, values in fields} for i in indices]
+
+def get_todo_columns(status_filter="all"):
+    """
+    列形式のTodoを取得する（stale-while-revalidate方式のキャッシュ機能付き）
+    ステータスでの絞り込みはスプレッドシート側で行うため、該当する行だけが転送される
     
-    # キャッシュが有効かチェック
-    now = datetime.now()
-    if _todos_cache is not None and _cache_timestamp is not None:
-        if now - _cache_timestamp < CACHE_DURATION:
-            # キャッシュが有効な場合はキャッシュを返す
-            return _todos_cache.copy()  # コピーを返して元のキャッシュを保護
+    Args:
+        status_filter (str, optional): None=未完了のみ, "完了"=完了のみ, "all"=すべて
     
-    # キャッシュが無効または存在しない場合は取得
+    Returns:
+        dict: 列形式のTodo（_to_columnsを参照）
+              コピーせずにキャッシュそのものを返すため、呼び出し側で変更しないこと
+              （辞書が必要な場合はmaterialize_todosで新しい辞書を作成する）
+              取得に失敗した場合は空のデータに"fetch_failed": Trueを付けて返す
+    """
+    try:
+        # 期限切れのキャッシュはそのまま返し、バックグラウンドで再取得する
+        return _todos_cache.get(_normalize_status_filter(status_filter), _query_todos)
+    except (IndexError, ValueError, gspread.exceptions.APIError) as e:
+        # エラーが発生した場合は空のデータを返す（0件と区別できるよう取得失敗の印を付ける）
+        print(f"警告: Todoの取得中にエラーが発生しました: {str(e)}")
+        columns = _to_columns([])
+        columns["fetch_failed"] = True
+        return columns
+
+def get_all_todos(status_filter="all"):
+    """
+    Todoを取得する（キャッシュ機能付き）
+    
+    Args:
+        status_filter (str, optional): None=未完了のみ, "完了"=完了のみ, "all"=すべて
+    
+    Returns:
+        list: Todoのリスト（各Todoは辞書形式）
+    """
+    columns = get_todo_columns(status_filter)
+    return materialize_todos(columns, range(len(columns["row"])))
+
+@_retry_transient
+def _get_row(row):
+    """
+    指定した行だけをスプレッドシートから取得する
+    
+    Args:
+        row (int): 取得する行番号
+    
+    Returns:
+        dict: Todoの情報（行が空の場合はNone）
+    """
     _, worksheet = get_or_create_spreadsheet()
+    # 期日・作成日時をシリアル値ではなく表示どおりの文字列で受け取るため、書式設定済みの値を読む
+    values = worksheet.batch_get([f"A{row}:G{row}"])[0]
+    
+    if not values or not values[0] or values[0][0] == "":
+        return None
+    return _row_to_todo(values[0], row)
+
+def _max_id(worksheet):
+    """
+    既存の最大IDを求める（ID採番用セルの初期化時・値が不正な場合に使用）
+    ID列（A列）だけを取得して最大値を求める
+    
+    Args:
+        worksheet (gspread.Worksheet): Todosワークシート
+    
+    Returns:
+        int: 既存の最大ID（Todoがない場合は0）
+    """
+    column = worksheet.batch_get(["A2:A"], value_render_option=ValueRenderOption.unformatted)[0]
+    
+    ids = [int(cell[0]) for cell in column if cell and str(cell[0]).isdigit()]
+    return max(ids) if ids else 0
+
+def get_todo_by_row(row):
+    """
+    行番号を指定してTodoを取得する
+    キャッシュになければ該当する行だけをスプレッドシートから読む
+    
+    Args:
+        row (int): 行番号
+    
+    Returns:
+        dict: Todoの情報（見つからない場合はNone）
+    """
+    # 1行目はヘッダー
+    if row < 2:
+        return None
+    
+    # キャッシュにあればスプレッドシートを読まずに返す
+    todo = _todos_cache.find_row(row)
+    if todo is not None:
+        return todo
     
     try:
-        # すべてのレコードを取得（ヘッダー行を含む）
-        all_values = worksheet.get_all_values()
-        
-        # 空のワークシートの場合は空のリストを返す
-        if not all_values or len(all_values) <= 1:
-            return []
-        
-        todos = []
-        # 2行目から開始（1行目はヘッダー）
-        for i, row in enumerate(all_values[1:], start=2):
-            # 行が空またはIDが空の場合はスキップ
-            if not row or len(row) == 0 or not row[0]:
-                continue
-            
-            # データが不足している場合はデフォルト値を使用
-            todo_id = row[0] if len(row) > 0 and row[0] else ""
-            title = row[1] if len(row) > 1 else ""
-            content = row[2] if len(row) > 2 else ""
-            due_date = row[3] if len(row) > 3 else ""
-            priority = row[4] if len(row) > 4 else "中"  # 重要度（デフォルト: 中）
-            created_at = row[5] if len(row) > 5 else ""
-            status = row[6] if len(row) > 6 else ""  # ステータス列
-            
-            todos.append({
-                "id": todo_id,
-                "row": i,  # 行番号を保存（編集・削除時に使用）
-                "title": title,
-                "content": content,
-                "due_date": due_date,
-                "priority": priority,
-                "created_at": created_at,
-                "status": status
-            })
-        
-        # キャッシュに保存
-        _todos_cache = todos
-        _cache_timestamp = now
-        
-        return todos
-    except (IndexError, gspread.exceptions.APIError) as e:
-        # エラーが発生した場合は空のリストを返す
+        return _get_row(row)
+    except gspread.exceptions.APIError as e:
         print(f"警告: Todoの取得中にエラーが発生しました: {str(e)}")
-        return []
+        return None
 
+@_retry_rate_limited
 def add_todo(title, content, due_date, priority="中"):
     """
     新しいTodoを追加する
@@ -279,23 +672,52 @@ def add_todo(title, content, due_date, priority="中"):
     
     Returns:
         dict: 追加されたTodoの情報
-    """
-    _, worksheet = get_or_create_spreadsheet()
-    
-    # 新しいIDを生成（既存の最大ID + 1）
-    todos = get_all_todos_filtered(status_filter="all")
-    if todos:
-        max_id = max(int(todo["id"]) for todo in todos if todo["id"].isdigit())
-        new_id = str(max_id + 1)
-    else:
-        new_id = "1"
     
-    # 現在の日時を取得
-    created_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    
-    # 新しい行を追加（重要度・ステータス列を含む）
-    row = [new_id, title, content, due_date, priority, created_at, ""]
-    worksheet.append_row(row)
+    Note:
+        IDの読み取りと行の追加は別々のリクエストのため、プロセス内ではロックで直列化している。
+        複数プロセスや他のクライアントから同時に追加した場合はIDが重複する可能性がある。
+    """
+    spreadsheet, worksheet = get_or_create_spreadsheet()
+    
+    with _id_lock:
+        # 新しいIDを生成（ID採番用セルの値 + 1）
+        values = worksheet.batch_get([ID_COUNTER_CELL], value_render_option=ValueRenderOption.unformatted)[0]
+        current_id = values[0][0] if values and values[0] else None
+        if not isinstance(current_id, int) or isinstance(current_id, bool):
+            # ID採番用セルが空・不正な値の場合は既存の最大IDから採番し直す
+            current_id = _max_id(worksheet)
+        new_id = str(current_id + 1)
+        
+        # 現在の日時を取得
+        created_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        
+        # 新しい行を追加（重要度・ステータス列を含む）
+        # 行の追加とID採番用セルの更新を1回のリクエストで行う
+        row = [new_id, title, content, due_date, priority, created_at, ""]
+        spreadsheet.batch_update({
+            "requests": [
+                {
+                    "appendCells": {
+                        "sheetId": worksheet.id,
+                        "rows": [{"values": [{"userEnteredValue": {"stringValue": value}} for value in row]}],
+                        "fields": "userEnteredValue"
+                    }
+                },
+                {
+                    "updateCells": {
+                        "range": {
+                            "sheetId": worksheet.id,
+                            "startRowIndex": 0,
+                            "endRowIndex": 1,
+                            "startColumnIndex": 8,
+                            "endColumnIndex": 9
+                        },
+                        "rows": [{"values": [{"userEnteredValue": {"numberValue": int(new_id)}}]}],
+                        "fields": "userEnteredValue"
+                    }
+                }
+            ]
+        })
     
     # キャッシュをクリア（データが更新されたため）
     clear_cache()
@@ -309,6 +731,7 @@ def add_todo(title, content, due_date, priority="中"):
         "created_at": created_at
     }
 
+@_retry_transient
 def update_todo(row, title, content, due_date, priority="中"):
     """
     Todoを更新する
@@ -323,11 +746,14 @@ def update_todo(row, title, content, due_date, priority="中"):
     _, worksheet = get_or_create_spreadsheet()
     
     # 行を更新（IDと作成日時は変更しない）
-    worksheet.update(f"B{row}:E{row}", [[title, content, due_date, priority]])
+    worksheet.batch_update([
+        {"range": f"B{row}:E{row}", "values": [[title, content, due_date, priority]]}
+    ])
     
     # キャッシュをクリア（データが更新されたため）
     clear_cache()
 
+@_retry_rate_limited
 def delete_todo(row):
     """
     Todoを削除する
@@ -341,6 +767,7 @@ def delete_todo(row):
     # キャッシュをクリア（データが更新されたため）
     clear_cache()
 
+@_retry_transient
 def complete_todo(row):
     """
     Todoを完了にする
@@ -350,11 +777,20 @@ def complete_todo(row):
     """
     _, worksheet = get_or_create_spreadsheet()
     # ステータス列（G列）を「完了」に更新
-    worksheet.update(f"G{row}", [["完了"]])
+    # 列を追加する場合も同じリクエストにまとめられるようにbatch_updateを使用
+    worksheet.batch_update([
+        {"range": f"G{row}", "values": [["完了"]]}
+    ])
     
     # キャッシュをクリア（データが更新されたため）
     clear_cache()
 
+def _normalize_status_filter(status_filter):
+    """
+    ステータスフィルタをSTATUS_QUERIESのキーに揃える（未知の値は「すべて」として扱う）
+    """
+    return status_filter if status_filter in STATUS_QUERIES else "all"
+
 def get_all_todos_filtered(status_filter=None):
     """
     ステータスでフィルタリングしたTodoを取得する
@@ -365,15 +801,4 @@ def get_all_todos_filtered(status_filter=None):
     Returns:
         list: Todoのリスト（各Todoは辞書形式）
     """
-    todos = get_all_todos()
-    
-    if status_filter is None:
-        # デフォルト: 未完了のタスクのみ
-        return [todo for todo in todos if not todo.get("status") or todo.get("status") != "完了"]
-    elif status_filter == "完了":
-        # 完了したタスクのみ
-        return [todo for todo in todos if todo.get("status") == "完了"]
-    else:
-        # すべてのタスク
-        return todos
-
+    return get_all_todos(_normalize_status_filter(status_filter))
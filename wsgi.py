@@ -0,0 +1,7 @@
+"""
+本番環境用のWSGIエントリーポイント
+gunicornから読み込んで使用する（例: gunicorn -k gthread -w 1 --threads 8 wsgi:application）
+"""
+from app import app
+
+application = app